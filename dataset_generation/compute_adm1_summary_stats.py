@@ -24,45 +24,24 @@ Excludes events with:
 
 import pandas as pd
 import numpy as np
+from utils.utils_misc import flags_to_bits
 
 DATA_DIR = "../data/"
 INPUT_FILEPATH = f"{DATA_DIR}emdat_modis_flood_dataset.csv"
 OUTPUT_FILEPATH = f"{DATA_DIR}adm1_summary_stats.csv"
 
-
-def filter_by_flags(df, flags, exclude=False):
-    """
-    Filter DataFrame by data quality flags.
-
-    Parameters
-    ----------
-    df : pd.DataFrame
-        Input DataFrame with 'flags' column
-    flags : list of int
-        Flag numbers to filter on
-    exclude : bool, optional
-        If True, exclude rows with these flags. If False, keep only rows with these flags.
-        Default is False.
-
-    Returns
-    -------
-    pd.DataFrame
-        Filtered DataFrame
-    """
-    # Handle NaN flags
-    mask = df["flags"].isna()
-
-    # Check if any of the specified flags are present
-    for flag in flags:
-        mask |= df["flags"].astype(str).str.contains(str(flag), na=False)
-
-    if exclude:
-        return df[~mask]
-    else:
-        return df[mask]
+# Columns used to compute the summary statistics
+INPUT_DTYPES = {
+    "mon-yr-adm1-id": str,
+    "adm1_code": float,
+    "flooded_population": float,
+    "flooded_area": float,
+    "flooded_area_norm": float,
+    "flags": str,
+}
 
 
-def compute_summary_stats(events_df):
+def compute_summary_stats(events_df, flag_bits=None):
     """
     Compute admin1-level summary statistics from flood events.
 
@@ -71,6 +50,9 @@ def compute_summary_stats(events_df):
     events_df : pd.DataFrame
         Flood events DataFrame with columns: adm1_code, flooded_population,
         flooded_area, flooded_area_norm, flags
+    flag_bits : np.ndarray, optional
+        Boolean flag matrix for `events_df` as returned by `flags_to_bits`. If None,
+        it is parsed from the 'flags' column.
 
     Returns
     -------
@@ -80,50 +62,45 @@ def compute_summary_stats(events_df):
     print("Computing admin1 summary statistics...")
     print(f"  Initial events: {len(events_df)}")
 
-    # Compute total event count per admin1 (ALL events, no filtering)
-    event_counts = (
-        events_df.groupby("adm1_code", as_index=False)
-        .agg({"mon-yr-adm1-id": "count"})
-        .rename(columns={"mon-yr-adm1-id": "event_count"})
+    if flag_bits is None:
+        flag_bits = flags_to_bits(events_df["flags"])
+
+    # Exclude events with flag 12 (zero flooded pixels) from mean calculations
+    # Events with no flags (NaN) are excluded too, as in the published stats
+    include = ~(flag_bits[:, 12] | events_df["flags"].isna().to_numpy())
+    print(f"  After excluding flag 12: {include.sum()}")
+
+    # Exclude rows with 0 or NaN in the flooded variables (NaN > 0 is False)
+    flooded_cols = ["flooded_population", "flooded_area", "flooded_area_norm"]
+    flooded_vals = events_df[flooded_cols].to_numpy(dtype=float)
+    include &= (flooded_vals > 0).all(axis=1)
+    print(f"  After excluding 0/NaN values: {include.sum()}")
+
+    # Integer group index per event; events without an adm1_code get -1
+    codes, adm1_codes = pd.factorize(events_df["adm1_code"], sort=True)
+    has_code = codes >= 0
+    n_groups = len(adm1_codes)
+
+    # Compute event counts (ALL events) per admin1
+    has_id = has_code & events_df["mon-yr-adm1-id"].notna().to_numpy()
+    summary_df = pd.DataFrame(
+        {
+            "adm1_code": adm1_codes,
+            "event_count": np.bincount(codes[has_id], minlength=n_groups),
+        }
     )
-    print(f"  Event counts computed for {len(event_counts)} admin1 regions")
-
-    # Filter out events with flag 12 (zero flooded pixels) for mean calculations
-    events_filtered = filter_by_flags(events_df, flags=[12], exclude=True)
-    print(f"  After excluding flag 12: {len(events_filtered)}")
-
-    # Filter out rows with 0 or NaN in the flooded variables
-    events_filtered = events_filtered[
-        (events_filtered["flooded_population"] > 0)
-        & (events_filtered["flooded_area"] > 0)
-        & (events_filtered["flooded_area_norm"] > 0)
-        & events_filtered["flooded_population"].notna()
-        & events_filtered["flooded_area"].notna()
-        & events_filtered["flooded_area_norm"].notna()
-    ]
-    print(f"  After excluding 0/NaN values: {len(events_filtered)}")
-
-    # Compute mean values from filtered data
+
+    # Compute means from included events with a groupby on the integer index
+    # pandas sums with compensated summation, so means match a plain groupby
+    include &= has_code
     mean_stats = (
-        events_filtered.groupby("adm1_code", as_index=False)
-        .agg(
-            {
-                "flooded_population": "mean",
-                "flooded_area": "mean",
-                "flooded_area_norm": "mean",
-            }
-        )
-        .rename(
-            columns={
-                "flooded_population": "mean_flooded_population",
-                "flooded_area": "mean_flooded_area",
-                "flooded_area_norm": "mean_flooded_area_norm",
-            }
-        )
+        pd.DataFrame(flooded_vals[include], columns=flooded_cols)
+        .groupby(codes[include])
+        .mean()
+        .reindex(range(n_groups))
     )
-
-    # Merge event counts with mean statistics
-    summary_df = event_counts.merge(mean_stats, on="adm1_code", how="left")
+    for col in flooded_cols:
+        summary_df[f"mean_{col}"] = mean_stats[col].to_numpy()
 
     print(f"  Summary computed for {len(summary_df)} admin1 regions")
 
@@ -134,10 +111,15 @@ def main():
     """Main execution function."""
     # Read the dataset
     print(f"Reading data from {INPUT_FILEPATH}...")
-    events_df = pd.read_csv(INPUT_FILEPATH)
+    events_df = pd.read_csv(
+        INPUT_FILEPATH, usecols=list(INPUT_DTYPES), dtype=INPUT_DTYPES
+    )
+
+    # Parse flags once into a boolean matrix
+    flag_bits = flags_to_bits(events_df["flags"])
 
     # Compute summary statistics
-    summary_df = compute_summary_stats(events_df)
+    summary_df = compute_summary_stats(events_df, flag_bits=flag_bits)
 
     # Save to CSV
     summary_df.to_csv(OUTPUT_FILEPATH, index=False)
@@ -30,9 +30,10 @@ flooded area of zero, etc. See flag documentation for details.
 
 """
 
+import numpy as np
 import pandas as pd
 from utils.emdat_toolbox import add_event_dates
-from utils.utils_misc import summarize_flags
+from utils.utils_misc import summarize_flags, flags_to_bits, bits_to_flags
 
 DATA_DIR = "../data/"
 METRICS_FILEPATH = f"{DATA_DIR}event_metrics.csv"
@@ -42,6 +43,9 @@ EMDAT_NONDISAGREGGATED_FILEPATH = (
 )
 OUTPUT_FILEPATH = f"{DATA_DIR}emdat_modis_flood_dataset.csv"
 
+# EM-DAT record metadata columns that are not used in postprocessing
+EMDAT_UNUSED_COLS = ["Entry Date", "Last Update"]
+
 # Dictionary mapping problematic adm1_codes to correct countries per GAUL
 # These codes appear in multiple countries in the source data but should be assigned to one country
 COUNTRY_CORRECTIONS = {
@@ -76,22 +80,11 @@ COUNTRY_CORRECTIONS = {
     40431: "Jammu and Kashmir",
 }
 
-
-def regex(flag):
-    """
-    Create a regex pattern to match a specific flag in a semicolon-separated string.
-
-    Parameters
-    ----------
-    flag : int or str
-        Flag number to match.
-
-    Returns
-    -------
-    str
-        Regex pattern string.
-    """
-    return rf"(?:^|;\s*){flag}(?:$|;\s*)"
+# Notes written to data_processing_flags by add_event_dates, mapped to their flag numbers
+DATA_PROCESSING_TEXT_FLAGS = {
+    "Start day originally NaN": 1,
+    "End day originally NaN": 2,
+}
 
 
 def get_missing_rows(emdat_orig_df, emdat_processed_df):
@@ -114,13 +107,11 @@ def get_missing_rows(emdat_orig_df, emdat_processed_df):
     """
     print("Identifying missing events and adding flags...")
 
-    # Get IDs that are missing from the final dataset
-    orig_ids = emdat_orig_df["id"].unique()
+    # Get rows whose IDs are missing from the final dataset
     final_df_ids = emdat_processed_df["id"].unique()
-    missing_ids = [id for id in orig_ids if id not in final_df_ids]
+    missing_df = emdat_orig_df[~emdat_orig_df["id"].isin(final_df_ids)].copy()
 
     # Create flags column
-    missing_df = emdat_orig_df[emdat_orig_df["id"].isin(missing_ids)].copy()
     missing_df["data_processing_flags"] = ""  # Required for add_event_dates function
     missing_df["flags"] = ""
 
@@ -140,10 +131,9 @@ def get_missing_rows(emdat_orig_df, emdat_processed_df):
     missing_df.loc[mask11, "flags"] += "; 11"
     print(f"  Added flag 11 to {mask11.sum()} missing events (other reasons)")
 
-    # Format the date same as the metrics, as a string
+    # Store dates as datetimes, same as the metrics
     for col in ["Start Date", "End Date"]:
         missing_df[col] = pd.to_datetime(missing_df[col], errors="coerce")
-        missing_df[col] = missing_df[col].dt.strftime("%m/%d/%Y")
 
     return missing_df
 
@@ -190,6 +180,10 @@ def add_data_flags(metrics_df, emdat_df, emdat_orig_df):
     flags_df = emdat_df.merge(metrics_df, on=list(emdat_df.columns), how="left")
     flags_df["flags"] = ""
 
+    # Parse the date strings read from CSV once
+    for col in ["Start Date", "End Date"]:
+        flags_df[col] = pd.to_datetime(flags_df[col], format="ISO8601")
+
     # Get missing rows and add appropriate flags
     missing_df = get_missing_rows(emdat_orig_df, metrics_df)
     missing_df = missing_df[
@@ -197,109 +191,76 @@ def add_data_flags(metrics_df, emdat_df, emdat_orig_df):
     ]
     flags_df = pd.concat([flags_df, missing_df], ignore_index=True)
 
-    # Replace EMDAT preprocessing string flags with appropriate numerical flags
-    mask1 = flags_df["data_processing_flags"].str.contains(
-        "Start day originally NaN", na=False
+    # Collect flags in a boolean flag matrix, starting from the missing event flags
+    flag_bits = flags_to_bits(flags_df["flags"])
+
+    # Parse data processing flags once into a boolean flag matrix
+    dpf_bits = flags_to_bits(
+        flags_df["data_processing_flags"], text_flags=DATA_PROCESSING_TEXT_FLAGS
     )
-    flags_df.loc[mask1, "flags"] += "; 1"
+
+    # Replace EMDAT preprocessing string flags with appropriate numerical flags
+    mask1 = dpf_bits[:, 1]
+    flag_bits[:, 1] |= mask1
     print(f"  Added flag 1 to {mask1.sum()} events (start day originally NaN)")
 
-    mask2 = flags_df["data_processing_flags"].str.contains(
-        "End day originally NaN", na=False
-    )
-    flags_df.loc[mask2, "flags"] += "; 2"
+    mask2 = dpf_bits[:, 2]
+    flag_bits[:, 2] |= mask2
     print(f"  Added flag 2 to {mask2.sum()} events (end day originally NaN)")
 
     # Direct copy flags
-    mask7 = flags_df["data_processing_flags"].str.contains(regex(7), na=False)
-    flags_df.loc[mask7, "flags"] += "; 7"
-    print(f"  Added flag 7 to {mask7.sum()} events")
+    for flag in [7, 8, 13, 14, 15]:
+        mask = dpf_bits[:, flag]
+        flag_bits[:, flag] |= mask
+        print(f"  Added flag {flag} to {mask.sum()} events")
 
-    mask8 = flags_df["data_processing_flags"].str.contains(regex(8), na=False)
-    flags_df.loc[mask8, "flags"] += "; 8"
-    print(f"  Added flag 8 to {mask8.sum()} events")
-
-    mask13 = flags_df["data_processing_flags"].str.contains(regex(13), na=False)
-    flags_df.loc[mask13, "flags"] += "; 13"
-    print(f"  Added flag 13 to {mask13.sum()} events")
-
-    mask14 = flags_df["data_processing_flags"].str.contains(regex(14), na=False)
-    flags_df.loc[mask14, "flags"] += "; 14"
-    print(f"  Added flag 14 to {mask14.sum()} events")
-
-    mask15 = flags_df["data_processing_flags"].str.contains(regex(15), na=False)
-    flags_df.loc[mask15, "flags"] += "; 15"
-    print(f"  Added flag 15 to {mask15.sum()} events")
+    # Error messages are matched as literal substrings
+    error_str = flags_df["metrics_error"].str
 
     # GPW file not found
-    mask5 = flags_df["metrics_error"].str.contains(
-        "data/GPW_by_adm1/", na=False
-    ) & flags_df["metrics_error"].str.contains("FileNotFound", na=False)
-    flags_df.loc[mask5, "flags"] += "; 5"
+    mask5 = error_str.contains(
+        "data/GPW_by_adm1/", na=False, regex=False
+    ) & error_str.contains("FileNotFound", na=False, regex=False)
+    flag_bits[:, 5] |= mask5.to_numpy()
     print(f"  Added flag 5 to {mask5.sum()} events (GPW file not found)")
 
     # Coordinate mismatch
     mask6 = (
-        flags_df["metrics_error"].str.contains("ValueError", na=False)
-        & flags_df["metrics_error"].str.contains("Coordinate", na=False)
-        & flags_df["metrics_error"].str.contains("has mismatched shapes", na=False)
+        error_str.contains("ValueError", na=False, regex=False)
+        & error_str.contains("Coordinate", na=False, regex=False)
+        & error_str.contains("has mismatched shapes", na=False, regex=False)
     )
-    flags_df.loc[mask6, "flags"] += "; 6"
+    flag_bits[:, 6] |= mask6.to_numpy()
     print(f"  Added flag 6 to {mask6.sum()} events (coordinate mismatch)")
 
     # Start date before Terra satellite data available
-    mask3 = pd.to_datetime(flags_df["Start Date"], format="mixed") < pd.to_datetime(
-        "2000-02-25"
-    )
-    flags_df.loc[mask3, "flags"] += "; 3"
+    mask3 = flags_df["Start Date"] < pd.Timestamp("2000-02-25")
+    flag_bits[:, 3] |= mask3.to_numpy()
     print(f"  Added flag 3 to {mask3.sum()} events (start date before 2000-02-25)")
 
     # No tif found for reasons other than flag 3
     mask4_metrics = (
-        flags_df["metrics_error"].str.contains("RasterioIOError", na=False)
-        & flags_df["metrics_error"].str.contains(
-            ".tif: No such file or directory", na=False
-        )
+        error_str.contains("RasterioIOError", na=False, regex=False)
+        & error_str.contains(".tif: No such file or directory", na=False, regex=False)
         & (~mask3)
     )
-    flags_df.loc[mask4_metrics, "flags"] += "; 4"
+    flag_bits[:, 4] |= mask4_metrics.to_numpy()
     print(f"  Added flag 4 to {mask4_metrics.sum()} events (no tif found)")
 
     # Flooded area = 0
     mask12 = flags_df["flooded_area"] == 0
-    flags_df.loc[mask12, "flags"] += "; 12"
+    flag_bits[:, 12] |= mask12.to_numpy()
     print(f"  Added flag 12 to {mask12.sum()} events (flooded area = 0)")
 
     # Drop temporary columns
     flags_df = flags_df.drop(columns=["data_processing_flags", "metrics_error"])
 
-    # Sort and clean flags
-    flags_df["flags"] = flags_df["flags"].apply(sort_flags)
-    flags_df["flags"] = flags_df["flags"].str.lstrip("; ")
+    # Format flags as sorted strings
+    flags_df["flags"] = bits_to_flags(flag_bits)
 
     return flags_df
 
 
-def sort_flags(flag_str):
-    """
-    Sort numbers in a semicolon-separated flag string in ascending order.
-
-    Parameters
-    ----------
-    flag_str : str
-        String of numbers separated by semicolons, e.g., "12; 2; 1".
-
-    Returns
-    -------
-    str
-        Sorted numbers as a semicolon-separated string, e.g., "1; 2; 12".
-    """
-    if not flag_str:
-        return ""
-    nums = [int(f) for f in flag_str.split(";") if f.strip()]
-    return "; ".join(map(str, sorted(nums)))
-
-
 def add_event_duration(df):
     """
     Add event duration in days.
@@ -328,7 +289,7 @@ def correct_country_assignments(df):
     Parameters
     ----------
     df : pd.DataFrame
-        DataFrame with 'adm1_code' and 'Country' columns.
+        DataFrame with an 'adm1_code' column and optionally a 'Country' column.
 
     Returns
     -------
@@ -336,12 +297,13 @@ def correct_country_assignments(df):
         DataFrame with corrected country assignments.
     """
     print("\nCorrecting country assignments...")
-    corrections_made = 0
-    for code, correct_country in COUNTRY_CORRECTIONS.items():
-        mask = df["adm1_code"] == code
-        if mask.any():
-            df.loc[mask, "Country"] = correct_country
-            corrections_made += mask.sum()
+    corrected_country = df["adm1_code"].map(COUNTRY_CORRECTIONS)
+    corrections_made = corrected_country.notna().sum()
+    # EM-DAT data may not have a Country column; only create it if needed
+    if "Country" in df:
+        df["Country"] = corrected_country.fillna(df["Country"])
+    elif corrections_made > 0:
+        df["Country"] = corrected_country
     print(
         f"  Corrected {corrections_made} rows across {len(COUNTRY_CORRECTIONS)} admin1 codes"
     )
@@ -365,10 +327,10 @@ def sort_by_original_order(df, emdat_orig_df):
         Sorted dataframe.
     """
     print("\nSorting by original event order...")
-    df["id"] = pd.Categorical(
-        df["id"], categories=emdat_orig_df["id"].values, ordered=True
-    )
-    df = df.sort_values("id").reset_index(drop=True)
+    # Rank each event by its position in the original EM-DAT data
+    order = pd.Series(np.arange(len(emdat_orig_df)), index=emdat_orig_df["id"])
+    rank = df["id"].map(order).to_numpy(dtype=float)
+    df = df.iloc[np.argsort(rank, kind="stable")].reset_index(drop=True)
     print(f"  Sorted {len(df)} events")
     return df
 
@@ -381,19 +343,27 @@ def main():
 
     # Read in data
     print("\nReading input files...")
-    metrics_df = pd.read_csv(METRICS_FILEPATH)
-    emdat_df = pd.read_csv(EMDAT_DISAGGREGATED_FILEPATH)
-    emdat_orig_df = pd.read_csv(EMDAT_NONDISAGREGGATED_FILEPATH)
+    metrics_df = pd.read_csv(METRICS_FILEPATH, dtype={"data_processing_flags": str})
+    emdat_df = pd.read_csv(
+        EMDAT_DISAGGREGATED_FILEPATH, dtype={"data_processing_flags": str}
+    )
+    emdat_orig_df = pd.read_csv(
+        EMDAT_NONDISAGREGGATED_FILEPATH,
+        usecols=lambda col: col not in EMDAT_UNUSED_COLS,
+        dtype={"id": str, "ISO": str, "Admin Units": str},
+    )
     print(f"  Loaded {len(metrics_df)} metric records")
     print(f"  Loaded {len(emdat_df)} disaggregated events")
     print(f"  Loaded {len(emdat_orig_df)} original events")
 
+    # Store admin1 codes as nullable integers rather than floats
+    for df in [metrics_df, emdat_df]:
+        df["adm1_code"] = df["adm1_code"].astype("Int64")
+
     # Step 1: Add data quality flags
     output_df = add_data_flags(metrics_df, emdat_df, emdat_orig_df)
 
-    # Step 2: Convert dates to datetime and add event duration
-    output_df["Start Date"] = pd.to_datetime(output_df["Start Date"], format="mixed")
-    output_df["End Date"] = pd.to_datetime(output_df["End Date"], format="mixed")
+    # Step 2: Add event duration
     output_df = add_event_duration(output_df)
 
     # Step 3: Sort by original event order
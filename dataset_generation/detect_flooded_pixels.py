@@ -112,7 +112,7 @@ def build_emdat_geodataframe(logger):
     logger.info(f"{inspect.currentframe().f_code.co_name}: Starting...")
 
     # Read in data
-    gaul_l1 = gpd.read_file(GAUL_L1_FILEPATH).rename(
+    gaul_l1 = gpd.read_file(GAUL_L1_FILEPATH, columns=["ADM1_CODE"]).rename(
         columns={"ADM1_CODE": "adm1_code", "geometry": "adm1_geometry"}
     )
     emdat = pd.read_csv(EMDAT_FILEPATH)
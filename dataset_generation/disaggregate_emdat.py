@@ -21,12 +21,11 @@ $ python disaggregate_emdat.py
 """
 
 import pandas as pd
-import numpy as np
 import inspect
 import geopandas as gpd
 from utils.emdat_toolbox import (
     expand_admin_units,
-    split_event_by_month,
+    split_events_by_month,
     add_event_dates,
 )
 from utils.utils_misc import check_dir_exists, check_file_exists
@@ -36,10 +35,27 @@ EMDAT_FILEPATH = f"{DATA_DIR}emdat_2000_2024.csv"
 GAUL_L2_FILEPATH = f"{DATA_DIR}g2015_2014_2/"
 OUTPUT_FILEPATH = f"{DATA_DIR}emdat_floods_by_mon_yr_adm1.csv"
 
+# EM-DAT columns used by the pipeline (data_processing_flags is optional)
+EMDAT_COLS = [
+    "id",
+    "ISO",
+    "Start Year",
+    "Start Month",
+    "Start Day",
+    "End Year",
+    "End Month",
+    "End Day",
+    "Admin Units",
+    "data_processing_flags",
+]
+
 
 def read_gaul_shapefile(gaul_filepath):
     """
-    Read GAUL level 2 shapefile and remove duplicates.
+    Read GAUL level 2 attribute table and remove duplicates.
+
+    Geometries are not needed for matching admin codes, so only the
+    admin code and name columns are read.
 
     Parameters
     ----------
@@ -48,16 +64,20 @@ def read_gaul_shapefile(gaul_filepath):
 
     Returns
     -------
-    geopandas.GeoDataFrame
-        GAUL level 2 GeoDataFrame.
+    pandas.DataFrame
+        GAUL level 2 DataFrame with ADM2_CODE, ADM1_CODE, and ADM1_NAME columns.
     """
     print(f"{inspect.currentframe().f_code.co_name}: Starting...")
 
-    gaul_l2 = gpd.read_file(gaul_filepath)
+    gaul_l2 = gpd.read_file(
+        gaul_filepath,
+        columns=["ADM2_CODE", "ADM1_CODE", "ADM1_NAME"],
+        ignore_geometry=True,
+    )
 
     # Only 5 admin 2 codes are duplicates
     # Drop them and keep the first value
-    gaul_l2.drop_duplicates(subset=["ADM2_CODE"], keep="first", inplace=True)
+    gaul_l2 = gaul_l2[~gaul_l2["ADM2_CODE"].duplicated(keep="first")]
 
     print(f"{inspect.currentframe().f_code.co_name}: Completed successfully")
 
@@ -72,8 +92,8 @@ def expand_admin_zones(emdat_df, gaul_l2):
     ----------
     emdat_df : pandas.DataFrame
         EM-DAT flood events DataFrame.
-    gaul_l2 : geopandas.GeoDataFrame
-        GAUL level 2 GeoDataFrame.
+    gaul_l2 : pandas.DataFrame
+        GAUL level 2 admin codes and names.
 
     Returns
     -------
@@ -82,26 +102,19 @@ def expand_admin_zones(emdat_df, gaul_l2):
     """
     print(f"{inspect.currentframe().f_code.co_name}: Starting...")
 
-    expanded_data = []
-    for _, row in emdat_df.iterrows():
-        static_columns = [col for col in emdat_df.columns if col not in ["Admin Units"]]
-        expanded_data.extend(expand_admin_units(row, static_columns))
+    emdat_df = expand_admin_units(emdat_df)
 
-    emdat_df = pd.DataFrame(expanded_data)
+    # Look up GAUL admin1 info based on Admin2 code
+    adm1_code_map = dict(zip(gaul_l2["ADM2_CODE"], gaul_l2["ADM1_CODE"]))
+    adm1_name_map = dict(zip(gaul_l2["ADM2_CODE"], gaul_l2["ADM1_NAME"]))
 
-    # Merge GAUL info based on Admin2 code
-    emdat_df = pd.merge(
-        emdat_df,
-        gaul_l2[["ADM2_CODE", "ADM1_CODE", "ADM1_NAME"]],
-        how="left",
-        left_on=["adm2_code"],
-        right_on=["ADM2_CODE"],
+    # Combine GAUL info with EM-DAT data
+    emdat_df["adm1_code"] = emdat_df["adm1_code"].fillna(
+        emdat_df["adm2_code"].map(adm1_code_map)
+    )
+    emdat_df["adm1_name"] = emdat_df["adm1_name"].fillna(
+        emdat_df["adm2_code"].map(adm1_name_map)
     )
-
-    # Combine GAUL columns with EM-DAT data
-    emdat_df["adm1_code"] = emdat_df["adm1_code"].combine_first(emdat_df["ADM1_CODE"])
-    emdat_df["adm1_name"] = emdat_df["adm1_name"].combine_first(emdat_df["ADM1_NAME"])
-    emdat_df = emdat_df.drop(["ADM2_CODE", "ADM1_CODE", "ADM1_NAME"], axis=1)
 
     # Drop rows with missing data
     emdat_df = emdat_df.dropna(subset=["adm1_code"])
@@ -130,9 +143,7 @@ def add_monthly_rows(emdat_df):
     """
     print(f"{inspect.currentframe().f_code.co_name}: Starting...")
 
-    df = pd.concat(
-        [split_event_by_month(row) for _, row in emdat_df.iterrows()], ignore_index=True
-    )
+    df = split_events_by_month(emdat_df)
 
     print(f"{inspect.currentframe().f_code.co_name}: Completed successfully")
 
@@ -157,13 +168,10 @@ def append_adm1_code_to_id(df):
     """
     print(f"{inspect.currentframe().f_code.co_name}: Starting...")
 
-    def _make_mon_yr_adm1_id(row):
-        if pd.notna(row["adm1_code"]):
-            return f"{row['mon-yr-id']}-{int(row['adm1_code'])}"
-        else:
-            return np.nan
-
-    df["mon-yr-adm1-id"] = df.apply(_make_mon_yr_adm1_id, axis=1)
+    adm1_code = df["adm1_code"].astype("Int64").astype(str)
+    df["mon-yr-adm1-id"] = (df["mon-yr-id"].astype(str) + "-" + adm1_code).where(
+        df["adm1_code"].notna()
+    )
 
     print(f"{inspect.currentframe().f_code.co_name}: Completed successfully")
 
@@ -210,7 +218,11 @@ def main():
     check_dir_exists(GAUL_L2_FILEPATH)
 
     # Read in data
-    emdat_df = pd.read_csv(EMDAT_FILEPATH)
+    emdat_df = pd.read_csv(
+        EMDAT_FILEPATH,
+        usecols=lambda col: col in EMDAT_COLS,
+        dtype={"id": str, "ISO": str, "Admin Units": str},
+    )
     gaul_l2 = read_gaul_shapefile(GAUL_L2_FILEPATH)
 
     # Initialize data processing flags column
@@ -218,8 +230,9 @@ def main():
         emdat_df["data_processing_flags"] = ""
     else:
         # Convert existing values to string and replace NaNs with empty strings
-        emdat_df["data_processing_flags"] = emdat_df["data_processing_flags"].apply(
-            lambda x: str(int(x)) if pd.notna(x) else ""
+        dpf = emdat_df["data_processing_flags"]
+        emdat_df["data_processing_flags"] = (
+            dpf.astype("Int64").astype(str).where(dpf.notna(), "")
         )
 
     # Expand admin zones (match to GAUL codes)
@@ -170,8 +170,8 @@ def main():
             f"{GPW_DIR}{year}/gpw_adm1_{adm1_code}_year_{year}.nc"
         )
 
-        # Open admin 1 boundaries
-        gaul_l1 = gpd.read_file(GAUL_L1_FILEPATH)
+        # Open admin 1 boundaries, reading only this event's admin1 zone
+        gaul_l1 = gpd.read_file(GAUL_L1_FILEPATH, where=f"ADM1_CODE = {adm1_code}")
 
         # Get adm1 geometry and bounds of the geometry
         adm1_geom = gaul_l1[gaul_l1["ADM1_CODE"] == adm1_code].geometry
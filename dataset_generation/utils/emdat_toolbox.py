@@ -7,10 +7,9 @@ Helper functions for EM-DAT disaster data preprocessing
 import numpy as np
 import pandas as pd
 import ast
-import calendar
+import json
 import pandas as pd
 import numpy as np
-import calendar
 
 
 def add_event_dates(emdat_df):
@@ -34,15 +33,11 @@ def add_event_dates(emdat_df):
     emdat_df = fill_missing_start_end_days(emdat_df)
 
     print(f"Formatting start and end date and creating new columns...")
-    emdat_df.loc[:, "Start Date"] = emdat_df.apply(
-        lambda row: get_datetime(
-            row["Start Year"], row["Start Month"], row["Start Day"]
-        ),
-        axis=1,
+    emdat_df.loc[:, "Start Date"] = get_datetime(
+        emdat_df["Start Year"], emdat_df["Start Month"], emdat_df["Start Day"]
     )
-    emdat_df.loc[:, "End Date"] = emdat_df.apply(
-        lambda row: get_datetime(row["End Year"], row["End Month"], row["End Day"]),
-        axis=1,
+    emdat_df.loc[:, "End Date"] = get_datetime(
+        emdat_df["End Year"], emdat_df["End Month"], emdat_df["End Day"]
     )
 
     return emdat_df
@@ -86,11 +81,11 @@ def fill_missing_start_end_days(df):
     )
 
     # Compute last day of the month
-    last_days = df.loc[valid_end_info].apply(
-        lambda row: calendar.monthrange(int(row["End Year"]), int(row["End Month"]))[1],
-        axis=1,
+    month_start = get_datetime(
+        df.loc[valid_end_info, "End Year"], df.loc[valid_end_info, "End Month"], 1
     )
-    df.loc[valid_end_info, "End Day"] = last_days.values
+    last_days = (month_start + pd.offsets.MonthEnd(0)).dt.day
+    df.loc[valid_end_info, "End Day"] = last_days
 
     # Append End Day flag
     df.loc[valid_end_info, "data_processing_flags"] += "; End day originally NaN"
@@ -98,91 +93,100 @@ def fill_missing_start_end_days(df):
     return df
 
 
-def expand_admin_units(row, static_columns):
+def parse_admin_units(admin_units):
     """
-    Expands the "Admin Units" column into separate rows while retaining other static columns.
+    Parse an "Admin Units" string into a list of admin unit dictionaries.
 
     Parameters
     ----------
-    row : pd.Series
-        A row from the input DataFrame.
-    static_columns : list
-        List of column names that should be retained in the expanded DataFrame.
+    admin_units : str
+        List string from the EM-DAT "Admin Units" column.
 
     Returns
     -------
     list
-        A list of dictionaries, each representing an expanded row.
+        List of admin unit dictionaries. Empty if the string cannot be parsed.
     """
     try:
-        # Read list string as python element
-        admin_units = ast.literal_eval(row["Admin Units"])
-        expanded_rows = []
-
-        # Iterate over each administrative unit
-        for unit in admin_units:
-            # Create a new row preserving static columns
-            expanded_row = {col: row[col] for col in static_columns}
-            expanded_row.update(
-                {
-                    "Admin Units": admin_units,
-                    "adm1_code": unit.get("adm1_code") or np.nan,
-                    "adm1_name": (
-                        np.nan
-                        if unit.get("adm1_name") == "Administrative unit not available"
-                        else unit.get("adm1_name") or np.nan
-                    ),
-                    "adm2_code": unit.get("adm2_code") or np.nan,
-                    "adm2_name": (
-                        np.nan
-                        if unit.get("adm2_name") == "Administrative unit not available"
-                        else unit.get("adm2_name") or np.nan
-                    ),
-                }
-            )
-            expanded_rows.append(expanded_row)
-
-        return expanded_rows
+        # Most entries are JSON, which parses much faster than a Python literal
+        return json.loads(admin_units)
+    except (ValueError, TypeError):
+        pass
+
+    try:
+        # Remaining entries use Python literal syntax (single quotes)
+        return ast.literal_eval(admin_units)
     except (ValueError, SyntaxError, TypeError):
         # Return an empty list if there's an issue parsing the "Admin Units" column
         return []
 
 
+def expand_admin_units(emdat_df):
+    """
+    Expands the "Admin Units" column into separate rows while retaining all other columns.
+
+    Parameters
+    ----------
+    emdat_df : pd.DataFrame
+        DataFrame with an "Admin Units" column.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with one row per administrative unit and new 'adm1_code', 'adm1_name',
+        'adm2_code', and 'adm2_name' columns. Events without parsable admin units are dropped.
+    """
+    unit_cols = ["adm1_code", "adm1_name", "adm2_code", "adm2_name"]
+
+    # Parse each list string once, then explode to one row per admin unit
+    expanded_df = emdat_df.assign(
+        admin_unit=emdat_df["Admin Units"].map(parse_admin_units)
+    ).explode("admin_unit", ignore_index=True)
+    expanded_df = expanded_df[expanded_df["admin_unit"].notna()].reset_index(drop=True)
+
+    # Flatten the admin unit dictionaries into columns
+    units_df = pd.DataFrame.from_records(
+        expanded_df["admin_unit"].tolist(), columns=unit_cols
+    )
+
+    # Treat zero codes, empty names, and placeholder names as missing
+    for col in ["adm1_code", "adm2_code"]:
+        units_df[col] = units_df[col].where(units_df[col] != 0)
+    for col in ["adm1_name", "adm2_name"]:
+        units_df[col] = units_df[col].where(
+            ~units_df[col].isin(["", "Administrative unit not available"])
+        )
+
+    return pd.concat([expanded_df.drop(columns="admin_unit"), units_df], axis=1)
+
+
 def get_datetime(year, month, day):
     """
-    Convert year, month, and day values into a pandas datetime object.
-    Returns NaN if any input value is NaN.
+    Convert year, month, and day columns into a pandas datetime column.
 
     Parameters
     ----------
-    year : float or int
+    year : pd.Series
         The year part of the date.
-    month : float or int
+    month : pd.Series
         The month part of the date.
-    day : float or int
+    day : pd.Series or int
         The day part of the date.
 
     Returns
     -------
-    pd.Timestamp or np.nan
-        A pandas datetime object corresponding to the given year, month, and day.
-        If any input is NaN, or if the date cannot be constructed, returns 'np.nan'.
+    pd.Series
+        Datetime Series built from the given year, month, and day. Rows where any
+        input is NaN, or where the date cannot be constructed, are NaT.
     """
-
-    # Check for NaN values
-    if any(np.isnan(val) for val in [year, month, day]):
-        return np.nan
-
-    # Convert year, month, and day from float to int for correct formatting
-    year, month, day = map(int, (year, month, day))
-
-    # Return the formatted datetime using pandas to_datetime function
-    return pd.to_datetime(f"{year}-{month}-{day}", format="%Y-%m-%d")
+    return pd.to_datetime(
+        pd.DataFrame({"year": year, "month": month, "day": day}), errors="coerce"
+    )
 
 
-def split_event_by_month(row):
+def split_events_by_month(emdat_df):
     """
-    Split a single disaster event row into multiple rows by month.
+    Split disaster events into multiple rows by month.
 
     Ensures that each resulting row contains:
     - Only the portion of the event occurring within a given month.
@@ -190,45 +194,61 @@ def split_event_by_month(row):
     - A new 'mon-yr' column in 'MM-YYYY' format.
     - A new 'mon-yr-id' column to uniquely identify monthly slices.
 
+    Events with a missing start or end date are kept as a single row with empty
+    'mon-yr' and 'mon-yr-id' values.
+
     Parameters
     ----------
-    row : pd.Series
-        A single row from a disaster event DataFrame, containing 'Start Date' and 'End Date'.
+    emdat_df : pd.DataFrame
+        Disaster event DataFrame, containing 'id', 'Start Date' and 'End Date'.
 
     Returns
     -------
     pd.DataFrame
-        A DataFrame with one row per month spanned by the event. All original columns are preserved.
+        A DataFrame with one row per month spanned by each event. All original columns are preserved.
     """
-    start = row["Start Date"]
-    end = row["End Date"]
-
-    # Handle missing start or end dates
-    if pd.isna(start) or pd.isna(end):
-        row = row.copy()
-        row["mon-yr"] = ""
-        row["mon-yr-id"] = ""
-        return pd.DataFrame([row])
-
-    # Generate list of month starts from first of start month to end date
-    months = pd.date_range(start.replace(day=1), end, freq="MS")
-
-    rows = []
-    for i, month_start in enumerate(months):
-        # Last day of current month
-        month_end = month_start + pd.offsets.MonthEnd(0)
-
-        # Determine actual start and end dates for this chunk
-        this_start = max(start, month_start)
-        this_end = min(end, month_end)
-
-        # Copy original row and update fields
-        row_copy = row.copy()
-        row_copy["Start Date"] = this_start
-        row_copy["End Date"] = this_end
-        row_copy["mon-yr"] = month_start.strftime("%m-%Y")
-        row_copy["mon-yr-id"] = f"{month_start.strftime('%m')}-{row_copy['id']}"
-
-        rows.append(row_copy)
-
-    return pd.DataFrame(rows)
+    start = pd.to_datetime(emdat_df["Start Date"])
+    end = pd.to_datetime(emdat_df["End Date"])
+    has_dates = (start.notna() & end.notna()).to_numpy()
+
+    # Months since year 0 for the first and last month of each event
+    start_month = (start.dt.year * 12 + start.dt.month - 1).to_numpy()
+    end_month = (end.dt.year * 12 + end.dt.month - 1).to_numpy()
+
+    # Number of monthly rows per event
+    n_months = np.ones(len(emdat_df), dtype=int)
+    n_months[has_dates] = np.clip(
+        end_month[has_dates] - start_month[has_dates] + 1, 0, None
+    )
+
+    # Repeat each event once per month and number the months within each event
+    row_idx = np.repeat(np.arange(len(emdat_df)), n_months)
+    month_offset = np.arange(len(row_idx)) - np.repeat(
+        np.cumsum(n_months) - n_months, n_months
+    )
+    df = emdat_df.iloc[row_idx].reset_index(drop=True)
+    df["Start Date"] = start.iloc[row_idx].reset_index(drop=True)
+    df["End Date"] = end.iloc[row_idx].reset_index(drop=True)
+    has_dates = has_dates[row_idx]
+
+    # First and last day of each month
+    month = start_month[row_idx] + month_offset
+    month_start = pd.to_datetime(
+        pd.DataFrame({"year": month // 12, "month": month % 12 + 1, "day": 1}),
+        errors="coerce",
+    ).where(has_dates)
+    month_end = month_start + pd.offsets.MonthEnd(0)
+
+    # Clip start and end dates to the month
+    df["Start Date"] = df["Start Date"].mask(
+        df["Start Date"] < month_start, month_start
+    )
+    df["End Date"] = df["End Date"].mask(df["End Date"] > month_end, month_end)
+
+    # Add month identifiers
+    df["mon-yr"] = month_start.dt.strftime("%m-%Y").fillna("")
+    df["mon-yr-id"] = (
+        month_start.dt.strftime("%m") + "-" + df["id"].astype(str)
+    ).fillna("")
+
+    return df
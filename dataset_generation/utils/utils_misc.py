@@ -6,6 +6,10 @@ Miscellaneous, general utils functions used across scripts
 """
 
 import os
+import numpy as np
+
+# Highest data quality flag number used in the final dataset
+NUM_FLAGS = 15
 
 
 def map_years_to_gpw_intervals():
@@ -21,6 +25,64 @@ def map_years_to_gpw_intervals():
     return {year: year - (year % 5) for year in range(2000, 2025)}
 
 
+def flags_to_bits(flags, num_flags=NUM_FLAGS, text_flags=None):
+    """
+    Parse semicolon-separated flag strings into a boolean flag matrix.
+
+    Parameters
+    ----------
+    flags : pd.Series
+        Flag strings, e.g. "1; 2; 12". NaN or empty strings mean no flags.
+        Read flag columns from CSV with a str dtype so that single flags are
+        not parsed as numbers.
+    num_flags : int, optional
+        Highest flag number. Default is NUM_FLAGS.
+    text_flags : dict, optional
+        Mapping of non-numeric tokens (e.g. "Start day originally NaN") to flag
+        numbers. Non-numeric tokens not in this mapping are ignored.
+
+    Notes
+    -----
+    Flag numbers above `num_flags` are ignored.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array of shape (len(flags), num_flags + 1). Element [i, k] is True
+        if row i has flag k. Column 0 is unused so flags can be indexed directly.
+    """
+    text_flags = text_flags or {}
+    tokens = flags.fillna("").str.split(";")
+    flag_bits = np.zeros((len(tokens), num_flags + 1), dtype=bool)
+    for i, row_flags in enumerate(tokens):
+        for flag in row_flags:
+            flag = flag.strip()
+            if flag.isdigit():
+                if int(flag) <= num_flags:
+                    flag_bits[i, int(flag)] = True
+            elif flag in text_flags:
+                flag_bits[i, text_flags[flag]] = True
+    return flag_bits
+
+
+def bits_to_flags(flag_bits):
+    """
+    Format a boolean flag matrix as sorted, semicolon-separated flag strings.
+
+    Parameters
+    ----------
+    flag_bits : np.ndarray
+        Boolean flag matrix as returned by `flags_to_bits`.
+
+    Returns
+    -------
+    list of str
+        One flag string per row in ascending order, e.g. "1; 2; 12". Rows without
+        flags are empty strings.
+    """
+    return ["; ".join(map(str, np.flatnonzero(row))) for row in flag_bits]
+
+
 def summarize_flags(flags_df, verbose=True):
     """
     Summarize the number and percentage of unique 'mon-yr-adm1-id' and 'id' associated with each flag.
@@ -12,11 +12,15 @@ import cartopy.crs as ccrs
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from time import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
 import inspect
 
 # Figure settings
 FIG_DPI = 600
+MAX_WORKERS = 4  # Number of maps rendered in parallel
+SIMPLIFY_TOLERANCE = 0.05  # Degrees; about one pixel at FIG_DPI
+MAP_PROJECTION = ccrs.Robinson()
 plt.rcParams["font.family"] = "Georgia"
 
 # Input paths
@@ -25,15 +29,104 @@ EVENTS_ADM1_FILEPATH = f"{DATA_DIR}adm1_summary_stats.csv"
 GAUL_L1_FILEPATH = f"{DATA_DIR}g2015_2014_1/"
 COUNTRY_BOUNDARIES_FILEPATH = f"{DATA_DIR}ne_110m_admin_0_countries"
 
+# Cache paths
+# Bump CACHE_VERSION whenever read_and_prepare_data changes how data is prepared
+# Caches from another version or tolerance aren't matched and get rebuilt
+CACHE_VERSION = 2  # v2: geometries projected into MAP_PROJECTION
+CACHE_DIR = f"{DATA_DIR}cache/"
+CACHE_TAG = f"v{CACHE_VERSION}_tol{SIMPLIFY_TOLERANCE}"
+EVENTS_ADM1_CACHE_FILEPATH = f"{CACHE_DIR}adm1_summary_stats_geom_{CACHE_TAG}.parquet"
+COUNTRIES_CACHE_FILEPATH = f"{CACHE_DIR}ne_110m_admin_0_countries_{CACHE_TAG}.parquet"
+
 # Output paths
 FIG_DIR = "figs/"
 MAPS_DIR = f"{FIG_DIR}adm1_maps/"
 
 
+def latest_mtime(path):
+    """
+    Get the most recent modification time of a file or of any file in a directory.
+
+    An empty directory uses the modification time of the directory itself.
+
+    Parameters
+    ----------
+    path : str
+        Path to a file or directory.
+
+    Returns
+    -------
+    float
+        Modification time in seconds since the epoch.
+    """
+    if os.path.isdir(path):
+        return max(
+            (os.path.getmtime(os.path.join(path, name)) for name in os.listdir(path)),
+            default=os.path.getmtime(path),
+        )
+    return os.path.getmtime(path)
+
+
+def project_to_map(gdf):
+    """
+    Project lon/lat geometries into the map projection.
+
+    Uses Cartopy's own geometry projection so features crossing the
+    antimeridian are cut the same way as when Cartopy projects at plot time.
+
+    Parameters
+    ----------
+    gdf : geopandas.GeoDataFrame
+        GeoDataFrame with geometries in longitude/latitude.
+
+    Returns
+    -------
+    geopandas.GeoDataFrame
+        Copy of `gdf` with geometries in MAP_PROJECTION coordinates.
+    """
+    src_crs = ccrs.PlateCarree()
+    projected = gpd.GeoSeries(
+        [MAP_PROJECTION.project_geometry(geom, src_crs) for geom in gdf.geometry],
+        index=gdf.index,
+        crs=MAP_PROJECTION.proj4_init,
+    )
+    return gpd.GeoDataFrame(gdf.drop(columns="geometry"), geometry=projected)
+
+
+def cache_is_current(cache_filepaths, source_filepaths):
+    """
+    Check that all cache files exist and are newer than all source files.
+
+    Parameters
+    ----------
+    cache_filepaths : list of str
+        Paths to cached files.
+    source_filepaths : list of str
+        Paths to the files or directories the cache was built from.
+
+    Returns
+    -------
+    bool
+        True if the cache can be used.
+    """
+    # Missing sources aren't current; rebuilding raises the usual read error
+    if not all(os.path.exists(path) for path in cache_filepaths + source_filepaths):
+        return False
+    oldest_cache = min(os.path.getmtime(path) for path in cache_filepaths)
+    return all(latest_mtime(path) < oldest_cache for path in source_filepaths)
+
+
 def read_and_prepare_data():
     """
     Read and prepare admin1 summary statistics and geographic boundaries.
 
+    Geometries are projected once into MAP_PROJECTION so every map can
+    reuse them. Country boundaries are returned as outlines.
+    The prepared GeoDataFrames are cached to GeoParquet in CACHE_DIR and
+    reused on later runs unless any input file is newer than the cache.
+    Cache filenames include CACHE_VERSION and SIMPLIFY_TOLERANCE, so
+    changing either one triggers a rebuild.
+
     Returns
     -------
     tuple
@@ -41,10 +134,24 @@ def read_and_prepare_data():
     """
     print(f"{inspect.currentframe().f_code.co_name}: Starting...")
 
+    # Load from cache if it is up to date
+    cache_filepaths = [EVENTS_ADM1_CACHE_FILEPATH, COUNTRIES_CACHE_FILEPATH]
+    source_filepaths = [
+        EVENTS_ADM1_FILEPATH,
+        GAUL_L1_FILEPATH,
+        COUNTRY_BOUNDARIES_FILEPATH,
+    ]
+    if cache_is_current(cache_filepaths, source_filepaths):
+        print(f"{inspect.currentframe().f_code.co_name}: Reading from {CACHE_DIR}")
+        events_adm1_df = gpd.read_parquet(EVENTS_ADM1_CACHE_FILEPATH)
+        countries_gdf = gpd.read_parquet(COUNTRIES_CACHE_FILEPATH)
+        print(f"{inspect.currentframe().f_code.co_name}: Complete.")
+        return events_adm1_df, countries_gdf
+
     # Read in data
     events_adm1_df = pd.read_csv(EVENTS_ADM1_FILEPATH)
-    gaul_l1 = gpd.read_file(GAUL_L1_FILEPATH)
-    countries_gdf = gpd.read_file(COUNTRY_BOUNDARIES_FILEPATH)
+    gaul_l1 = gpd.read_file(GAUL_L1_FILEPATH, columns=["ADM1_CODE"])
+    countries_gdf = gpd.read_file(COUNTRY_BOUNDARIES_FILEPATH, columns=["ADMIN"])
 
     # Drop Antarctica from countries
     countries_gdf = countries_gdf[countries_gdf["ADMIN"] != "Antarctica"]
@@ -54,10 +161,27 @@ def read_and_prepare_data():
         columns={"ADM1_CODE": "adm1_code"}
     )
 
+    # Simplify admin1 polygons to roughly the figure resolution
+    # GAUL has far more vertices than can be drawn at FIG_DPI
+    gaul_l1["geometry"] = gaul_l1.geometry.simplify(
+        SIMPLIFY_TOLERANCE, preserve_topology=True
+    )
+
+    # Project once here instead of once per map
+    # Outlines are taken before projecting so antimeridian cuts aren't drawn
+    gaul_l1 = project_to_map(gaul_l1)
+    countries_gdf = countries_gdf.assign(geometry=countries_gdf.boundary)
+    countries_gdf = project_to_map(countries_gdf)
+
     # Add in GAUL geometry for admin1 regions
     events_adm1_df = events_adm1_df.merge(gaul_l1, on="adm1_code", how="left")
     events_adm1_df = gpd.GeoDataFrame(events_adm1_df)
 
+    # Cache prepared data for later runs
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    events_adm1_df.to_parquet(EVENTS_ADM1_CACHE_FILEPATH)
+    countries_gdf.to_parquet(COUNTRIES_CACHE_FILEPATH)
+
     print(f"{inspect.currentframe().f_code.co_name}: Complete.")
 
     return events_adm1_df, countries_gdf
@@ -74,6 +198,7 @@ def make_map(
     save_path=None,
     borders=None,
     border_linewidth=0.15,
+    transform=ccrs.PlateCarree(),
 ):
     """
     Plot a geospatial DataFrame on a Robinson projection map.
@@ -101,6 +226,9 @@ def make_map(
         GeoDataFrame of boundaries for overlay. Default is None.
     border_linewidth: float, optional
         Linewidth of the borders. Default to 0.15
+    transform : cartopy.crs.CRS or None, optional
+        CRS of the geometries in `df` and `borders`. Use None if they are
+        already projected into MAP_PROJECTION. Default is PlateCarree.
 
     Notes
     -----
@@ -109,15 +237,18 @@ def make_map(
     optionally saved if `save_path` is provided.
     """
     # Initialize figure
-    fig, ax = plt.subplots(figsize=(10, 6), subplot_kw={"projection": ccrs.Robinson()})
+    fig, ax = plt.subplots(figsize=(10, 6), subplot_kw={"projection": MAP_PROJECTION})
+
+    # Geometries already in map coordinates don't need a transform
+    transform_kwargs = {} if transform is None else {"transform": transform}
 
-    # Compute vmin, vmax if not provided
-    if vmin is None:
-        vmin = df[col].quantile(0.05)  # 5th percentile
-    if vmax is None:
-        vmax = df[col].quantile(0.95)  # 95th percentile
+    # Compute vmin, vmax if not provided (5th and 95th percentiles)
+    if vmin is None or vmax is None:
+        q05, q95 = df[col].quantile([0.05, 0.95]).to_numpy()
+        vmin = q05 if vmin is None else vmin
+        vmax = q95 if vmax is None else vmax
 
-    # Plot data
+    # Plot data (fill is rasterized; borders below stay vector)
     df.plot(
         column=col,
         cmap=cmap,
@@ -126,16 +257,20 @@ def make_map(
         vmin=vmin,
         vmax=vmax,
         legend_kwds={"shrink": 0.5, "label": label, "extend": "max"},
-        transform=ccrs.PlateCarree(),
+        rasterized=True,
+        **transform_kwargs,
     )
 
-    # Plot additional borders
+    # Plot additional borders (polygons are drawn as outlines)
     if borders is not None:
-        borders.boundary.plot(
+        if borders.geom_type.str.contains("Polygon").any():
+            borders = borders.boundary
+        borders.plot(
             ax=ax,
             linewidth=border_linewidth,
             color="grey",
-            transform=ccrs.PlateCarree(),
+            rasterized=False,
+            **transform_kwargs,
         )
 
     # Make map pretty
@@ -164,45 +299,52 @@ def make_adm1_maps(events_adm1_df, countries_gdf):
     start_time = time()
     print(f"{inspect.currentframe().f_code.co_name}: Starting...")
 
-    make_map(
-        df=events_adm1_df,
-        col="mean_flooded_population",
-        label="Population",
-        title="Mean Flooded Population by Admin1 Region (2000-2024)",
-        cmap="Purples",
-        save_path=f"{MAPS_DIR}mean_flooded_population.png",
-        borders=countries_gdf,
-    )
-
-    make_map(
-        df=events_adm1_df,
-        col="mean_flooded_area",
-        label="Area (km²)",
-        title="Mean Flooded Area by Admin1 Region (2000-2024)",
-        cmap="Blues",
-        save_path=f"{MAPS_DIR}mean_flooded_area.png",
-        borders=countries_gdf,
-    )
-
-    make_map(
-        df=events_adm1_df,
-        col="mean_flooded_area_norm",
-        label="Normalized Area",
-        title="Mean Normalized Flooded Area by Admin1 Region (2000-2024)",
-        cmap="Blues",
-        save_path=f"{MAPS_DIR}mean_flooded_area_norm.png",
-        borders=countries_gdf,
-    )
-
-    make_map(
-        df=events_adm1_df,
-        col="event_count",
-        label="Number of Events",
-        title="Total Flood Events by Admin1 Region (2000-2024)",
-        cmap="Oranges",
-        save_path=f"{MAPS_DIR}event_count.png",
-        borders=countries_gdf,
-    )
+    map_kwargs = [
+        dict(
+            col="mean_flooded_population",
+            label="Population",
+            title="Mean Flooded Population by Admin1 Region (2000-2024)",
+            cmap="Purples",
+            save_path=f"{MAPS_DIR}mean_flooded_population.png",
+        ),
+        dict(
+            col="mean_flooded_area",
+            label="Area (km²)",
+            title="Mean Flooded Area by Admin1 Region (2000-2024)",
+            cmap="Blues",
+            save_path=f"{MAPS_DIR}mean_flooded_area.png",
+        ),
+        dict(
+            col="mean_flooded_area_norm",
+            label="Normalized Area",
+            title="Mean Normalized Flooded Area by Admin1 Region (2000-2024)",
+            cmap="Blues",
+            save_path=f"{MAPS_DIR}mean_flooded_area_norm.png",
+        ),
+        dict(
+            col="event_count",
+            label="Number of Events",
+            title="Total Flood Events by Admin1 Region (2000-2024)",
+            cmap="Oranges",
+            save_path=f"{MAPS_DIR}event_count.png",
+        ),
+    ]
+
+    # Maps are independent, so render them in parallel
+    # Only send each worker the geometry and the column it plots
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                make_map,
+                df=events_adm1_df[["geometry", kwargs["col"]]],
+                borders=countries_gdf,
+                transform=None,
+                **kwargs,
+            )
+            for kwargs in map_kwargs
+        ]
+        for future in futures:
+            future.result()
 
     td = timedelta(seconds=int(time() - start_time))
     print(f"{inspect.currentframe().f_code.co_name}: Complete.")